@@ -0,0 +1,255 @@
+# batch.py: Step many independent colonies in lockstep with array operations
+import argparse
+import time
+import numpy as np
+from src.crimes import CRIMES
+from src.events import (ARRIVAL_BAD_RATE, ARRIVAL_SETTLERS, CORRUPTION_CHANCE, EVENT_EFFECTS, EVENTS,
+                        HARDSHIP_DAYS, SABOTAGE_REVEAL_CHANCE, SUPPLY_BAD_RATE, SUPPLY_SETTLERS)
+from src.hubs import HUBS
+from src.model import BAD_ACTOR_HUBS, BAD_ACTOR_HUB_WEIGHTS, SETTLER_HUBS, SETTLER_HUB_WEIGHTS
+from src.runner import parse_params, summarize
+
+HUB_NAMES = list(HUBS.keys())
+NUM_HUBS = len(HUB_NAMES)
+MEDICAL_BAY = HUB_NAMES.index("Medical Bay")
+RISKY_HUBS = [HUB_NAMES.index(name) for name in ("Power Plant", "Factory", "Mining Outpost")]
+
+# Agent status codes
+EMPTY, SETTLER, LEO, DEAD = 0, 1, 2, 3
+
+EVENT_NAMES = [name for name, _, _ in EVENTS]
+EVENT_CUMULATIVE = np.cumsum([weight for _, weight, _ in EVENTS])
+EVENT_STRESS, EVENT_RESOURCES, EVENT_CIVILITY = np.array([EVENT_EFFECTS[name] for name in EVENT_NAMES]).T
+
+CRIME_NAMES = list(CRIMES.keys())
+CRIME_CUMULATIVE = np.cumsum([crime["normalized_probability"] for crime in CRIMES.values()])
+CRIME_STRESS = np.array([crime["stress_impact"] for crime in CRIMES.values()])
+MURDER = CRIME_NAMES.index("Murder/Nonnegligent Manslaughter")
+
+def _hub_table(hubs, weights):
+    # Hub indices and cumulative probabilities for inverse-CDF sampling
+    weights = np.asarray(weights, dtype=float)
+    return np.array([HUB_NAMES.index(h) for h in hubs]), np.cumsum(weights / weights.sum())
+
+SETTLER_HUB_IDX, SETTLER_HUB_CDF = _hub_table(SETTLER_HUBS, SETTLER_HUB_WEIGHTS)
+BAD_HUB_IDX, BAD_HUB_CDF = _hub_table(BAD_ACTOR_HUBS, BAD_ACTOR_HUB_WEIGHTS)
+
+class BatchedColonies:
+    """K independent colonies advanced one day at a time, with a leading replicate axis on all state.
+
+    Follows the same daily rules as GovernanceModel (hub choice, co-located crimes, weekly events,
+    stress, turning bad, deaths), but applies each day's same-kind effects to a colony together
+    and clamps once, so results match the model statistically rather than draw for draw. Like the
+    model today, LEOs never complete a chase and hub visits never pay out, so neither is simulated.
+    """
+
+    def __init__(self, replicates, seed=None, num_settlers=40, num_leos=4, bad_actor_rate=0.1,
+                 corrupt_leo_rate=0.05):
+        self.rng = np.random.default_rng(seed)
+        self.k = replicates
+        k, n = replicates, num_settlers + num_leos
+        self.week = 0
+        self.civility = np.full(k, 50.0)
+        self.resources = np.full(k, 100.0)
+        self.stress = np.zeros(k)
+        self.conflict_rate = np.zeros(k)
+        self.step_count = np.zeros(k, dtype=np.int64)
+        self.morgue_count = np.zeros(k, dtype=np.int64)
+        self.prison_count = np.zeros(k, dtype=np.int64)
+
+        # Agent state, shape (k, capacity); slots past size[k] are EMPTY
+        self.status = np.full((k, n), EMPTY, dtype=np.int8)
+        self.status[:, :num_settlers] = SETTLER
+        self.status[:, num_settlers:] = LEO
+        self.is_bad = np.zeros((k, n), dtype=bool)
+        self.is_bad[:, :num_settlers] = self.rng.random((k, num_settlers)) < bad_actor_rate
+        self.is_bad[:, num_settlers:] = self.rng.random((k, num_leos)) < corrupt_leo_rate
+        self.revealed = ~self.is_bad  # Hidden bad actors
+        self.revealed[:, num_settlers:] = True
+        self.power = self._roll_power((k, n))
+        self.hub = self.rng.integers(0, NUM_HUBS, (k, n)).astype(np.int8)  # Start at a random hub
+        self.has_target = np.zeros((k, n), dtype=bool)
+        self.size = np.full(k, n)
+
+    def _roll_power(self, shape):
+        return self.rng.integers(1, 7, shape + (3,)).sum(axis=-1).astype(np.int8)  # 3d6 roll (3-18)
+
+    def _adjust_stress(self, amount):
+        self.stress = np.clip(self.stress + amount, 0, 100)  # Cap stress at 0-100
+
+    def step(self):
+        """Advance every colony by one day."""
+        settlers = self.status == SETTLER
+        self._commit_crimes(settlers)
+        self._choose_hubs(settlers)
+        self.week += 1
+        self.step_count += 1
+        settled = self.size.copy()  # Settlers arriving with this week's event start moving next turn
+        if self.week % 7 == 0:
+            self._weekly_event()
+        civility_relief = (self.civility >= 70) & (self.rng.random(self.k) < 0.2)
+        self._adjust_stress(np.where(civility_relief, -5, 0))
+        if self.week > 7:  # The model never logs an "Incident", so only the 10% roll gates this relief
+            self._adjust_stress(np.where(self.rng.random(self.k) < 0.1, -10, 0))
+        self._end_of_day(settled)
+        self._adjust_stress(-0.1)  # Natural stress decay
+        living = (self.status == SETTLER) | (self.status == LEO)
+        revealed_bad = ((self.status == SETTLER) & self.is_bad & self.revealed).sum(axis=1)
+        population = living.sum(axis=1)
+        self.conflict_rate = np.divide(revealed_bad, population, out=np.zeros(self.k), where=population > 0)
+
+    def _commit_crimes(self, settlers):
+        # Revealed bad actors strike weaker settlers sharing their hub when no LEO is there
+        k, n = self.status.shape
+        colony = np.repeat(np.arange(k), n).reshape(k, n)
+        cell = colony * NUM_HUBS + self.hub
+        settler_count = np.bincount(cell[settlers], minlength=k * NUM_HUBS)
+        leo_count = np.bincount(cell[self.status == LEO], minlength=k * NUM_HUBS)
+        # Settlers per (colony, hub, power); cumulative over power gives "weaker than p" counts
+        by_power = np.bincount((cell * 19 + self.power)[settlers], minlength=k * NUM_HUBS * 19).reshape(-1, 19)
+        weaker_than = np.cumsum(by_power, axis=1) - by_power  # Strictly weaker
+        weaker = weaker_than[cell, self.power]
+        offenders = (settlers & self.is_bad & self.revealed & (settler_count[cell] > 1) & (leo_count[cell] == 0)
+                     & (weaker > 0) & (self.rng.random((k, n)) < 0.1))
+        if not offenders.any():
+            return
+        crimes = np.searchsorted(CRIME_CUMULATIVE, self.rng.random(offenders.sum()))
+        crimes = np.minimum(crimes, len(CRIME_NAMES) - 1)
+        offender_colony = colony[offenders]
+        self._adjust_stress(np.bincount(offender_colony, weights=CRIME_STRESS[crimes], minlength=k))
+        # Murders are rare enough to resolve one by one
+        for c, slot in zip(offender_colony[crimes == MURDER], np.flatnonzero(offenders.ravel())[crimes == MURDER] % n):
+            victims = np.flatnonzero((self.status[c] == SETTLER) & (self.hub[c] == self.hub[c, slot])
+                                     & (self.power[c] < self.power[c, slot]))
+            if victims.size:
+                self._kill(c, np.array([self.rng.choice(victims)]))
+
+    def _choose_hubs(self, settlers):
+        # Settlers without a target, or 10% of the rest, pick a new hub; LEOs all patrol in order
+        k, n = self.status.shape
+        move = settlers & (~self.has_target | (self.rng.random((k, n)) < 0.1))
+        u = self.rng.random((k, n))
+        bad = self.is_bad & self.revealed
+        good_pick = SETTLER_HUB_IDX[np.minimum(np.searchsorted(SETTLER_HUB_CDF, u), len(SETTLER_HUB_IDX) - 1)]
+        bad_pick = BAD_HUB_IDX[np.minimum(np.searchsorted(BAD_HUB_CDF, u), len(BAD_HUB_IDX) - 1)]
+        self.hub = np.where(move, np.where(bad, bad_pick, good_pick), self.hub).astype(np.int8)
+        self.has_target |= move
+        self.hub[self.status == LEO] = (self.week + 1) % NUM_HUBS
+
+    def _weekly_event(self):
+        k, n = self.status.shape
+        event = np.minimum(np.searchsorted(EVENT_CUMULATIVE, self.rng.uniform(0, EVENT_CUMULATIVE[-1], k)),
+                           len(EVENT_NAMES) - 1)
+        self._adjust_stress(EVENT_STRESS[event])
+        self.resources += EVENT_RESOURCES[event]
+        self.civility += EVENT_CIVILITY[event]
+        self.step_count += np.where(event == EVENT_NAMES.index("Environmental Hardship"), HARDSHIP_DAYS, 0)
+        corruption = event == EVENT_NAMES.index("Corruption Scandal")
+        self.is_bad |= corruption[:, None] & (self.status == LEO) & (self.rng.random((k, n)) < CORRUPTION_CHANCE)
+        sabotage = event == EVENT_NAMES.index("Sabotage Attempt")
+        self.revealed |= (sabotage[:, None] & (self.status == SETTLER) & self.is_bad
+                          & (self.rng.random((k, n)) < SABOTAGE_REVEAL_CHANCE))
+        arrival = event == EVENT_NAMES.index("New Settler Arrival")
+        supply = event == EVENT_NAMES.index("New Supply from Colony")
+        low, high = SUPPLY_SETTLERS
+        arrivals = np.where(arrival, ARRIVAL_SETTLERS, np.where(supply, self.rng.integers(low, high + 1, k), 0))
+        self._add_settlers(arrivals, np.where(arrival, ARRIVAL_BAD_RATE, SUPPLY_BAD_RATE))
+
+    def _add_settlers(self, counts, bad_rate):
+        # Append settlers after each colony's last used slot, growing capacity if needed
+        if not counts.any():
+            return
+        k, n = self.status.shape
+        needed = int((self.size + counts).max())
+        if needed > n:
+            grow = needed - n
+            self.status = np.pad(self.status, ((0, 0), (0, grow)), constant_values=EMPTY)
+            self.is_bad = np.pad(self.is_bad, ((0, 0), (0, grow)))
+            self.revealed = np.pad(self.revealed, ((0, 0), (0, grow)))
+            self.power = np.pad(self.power, ((0, 0), (0, grow)))
+            self.hub = np.pad(self.hub, ((0, 0), (0, grow)))
+            self.has_target = np.pad(self.has_target, ((0, 0), (0, grow)))
+            n = needed
+        slots = np.arange(n)
+        new = (slots >= self.size[:, None]) & (slots < (self.size + counts)[:, None])
+        self.status[new] = SETTLER
+        is_bad = self.rng.random((k, n)) < bad_rate[:, None]
+        self.is_bad[new] = is_bad[new]
+        self.revealed[new] = ~is_bad[new]
+        self.power[new] = self._roll_power((k, n))[new]
+        self.hub[new] = self.rng.integers(0, NUM_HUBS, (k, n)).astype(np.int8)[new]
+        self.has_target[new] = False
+        self.size += counts
+
+    def _end_of_day(self, settled):
+        # Stress can turn settlers bad; settlers at the Medical Bay or repairing damaged hubs can die
+        k, n = self.status.shape
+        moving = (self.status == SETTLER) & (np.arange(n) < settled[:, None])
+        turned = moving & ~self.is_bad & (self.rng.random((k, n)) < (self.stress / 2000)[:, None])
+        self.is_bad |= turned
+        self.revealed &= ~turned  # Starts as hidden
+        self._adjust_stress(5 * turned.sum(axis=1))
+        u = self.rng.random((k, n))
+        dies = moving & (self.hub == MEDICAL_BAY) & (u < 0.003)
+        if self.week % 7 == 0:  # Damaged hubs are risky on the first day of the week
+            dies |= moving & np.isin(self.hub, RISKY_HUBS) & (u < 0.01)
+        for c in np.flatnonzero(dies.any(axis=1)):
+            self._kill(c, np.flatnonzero(dies[c]))
+
+    def _kill(self, colony, slots):
+        self.status[colony, slots] = DEAD
+        self.morgue_count[colony] += len(slots)
+        self.stress[colony] = min(100, self.stress[colony] + 15 * len(slots))
+
+    def metrics(self):
+        """Colony-level metrics for the current day, one array entry per colony."""
+        living = (self.status == SETTLER) | (self.status == LEO)
+        return {
+            "day": np.full(self.k, self.week),
+            "civility": self.civility.copy(),
+            "resources": self.resources.copy(),
+            "stress": self.stress.copy(),
+            "conflict_rate": self.conflict_rate.copy(),
+            "population": living.sum(axis=1),
+            "morgue": self.morgue_count.copy(),
+            "prison": self.prison_count.copy(),
+        }
+
+def simulate_batch(replicates, days, seed=None, params=None):
+    """Run `replicates` colonies for a number of days; returns one runner.simulate()-style result each.
+
+    The colonies share one generator seeded with `seed`, so each result's "seed" is its replicate index.
+    """
+    colonies = BatchedColonies(replicates, seed, **(params or {}))
+    history = [colonies.metrics()]
+    for _ in range(days):
+        colonies.step()
+        history.append(colonies.metrics())
+    results = []
+    for i in range(replicates):
+        series = [{name: values[i].item() for name, values in day.items()} for day in history]
+        results.append({"seed": i, "summary": summarize(series), "series": series})
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many small colonies in one process with array stepping")
+    parser.add_argument("--replicates", type=int, default=256)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("params", nargs="*", help="GovernanceModel params, e.g. num_leos=8")
+    args = parser.parse_args()
+    try:
+        params = parse_params(args.params)
+    except ValueError as e:
+        parser.error(str(e))
+
+    start = time.perf_counter()
+    results = simulate_batch(args.replicates, args.days, args.seed, params)
+    elapsed = time.perf_counter() - start
+    print(f"{args.replicates} colonies x {args.days} days in {elapsed:.2f}s ({args.replicates / elapsed:.1f} runs/s)")
+    for metric in ("civility", "resources", "stress", "population", "morgue", "mean_stress", "mean_conflict_rate"):
+        values = np.array([r["summary"][metric] for r in results])
+        print(f"{metric:<20}mean {values.mean():>9.2f}  sd {values.std(ddof=1) if len(values) > 1 else 0:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# compare.py: Paired scenario comparison with common random numbers and variance reduction
+import argparse
+import math
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from src.runner import parse_params, simulate
+from src.streams import derive_seed
+
+METRICS = ["civility", "resources", "stress", "population", "morgue", "prison", "mean_stress", "mean_conflict_rate"]
+Z_95 = statistics.NormalDist().inv_cdf(0.975)  # Normal approximation for the confidence interval
+
+def plan_runs(params_a, params_b, replicates, days, seed=0, mode="crn", antithetic=False, stratified=False):
+    """List the simulate() calls for both scenarios; runs with the same index form a pair.
+
+    mode "crn" gives both scenarios of a pair the same per-site streams, "independent" gives
+    them unrelated streams. antithetic makes every odd replicate the mirror (u -> 1 - u) of the
+    even one before it. stratified deals each replicate its own slice of every draw instead of
+    independent seeds, so the ensemble covers the range of outcomes evenly (its standard errors,
+    computed as if replicates were independent, are then conservative).
+    """
+    runs = []
+    for i in range(replicates):
+        base = i - i % 2 if antithetic else i  # Antithetic replicates share their partner's seed
+        for label, params in (("a", params_a), ("b", params_b)):
+            if stratified:
+                stream_seed = derive_seed(seed, "stratified") if mode == "crn" else derive_seed(seed, "stratified", label)
+                streams = {"seed": stream_seed, "stratum": i, "strata": replicates}
+            else:
+                stream_seed = derive_seed(seed, base) if mode == "crn" else derive_seed(seed, base, label)
+                streams = {"seed": stream_seed}
+            streams["antithetic"] = antithetic and i % 2 == 1
+            run_seed = derive_seed(seed, i) if mode == "crn" else derive_seed(seed, i, label)
+            runs.append((run_seed % 2 ** 32, days, params, streams))
+    return runs
+
+def _run(job):
+    seed, days, params, streams = job
+    return simulate(seed, days, params, streams)["summary"]
+
+def paired_statistics(summaries_a, summaries_b, antithetic=False):
+    """Per-metric means, paired difference (b - a) with its standard error, and variance reduction."""
+    if antithetic:  # Average each antithetic pair into one independent observation
+        summaries_a = [_average(summaries_a[i:i + 2]) for i in range(0, len(summaries_a), 2)]
+        summaries_b = [_average(summaries_b[i:i + 2]) for i in range(0, len(summaries_b), 2)]
+    n = len(summaries_a)
+    report = {}
+    for metric in METRICS:
+        a = [s[metric] for s in summaries_a]
+        b = [s[metric] for s in summaries_b]
+        diffs = [y - x for x, y in zip(a, b)]
+        mean_diff = statistics.fmean(diffs)
+        sd_diff = statistics.stdev(diffs) if n > 1 else 0.0
+        se = sd_diff / math.sqrt(n) if n else 0.0
+        var_a = statistics.variance(a) if n > 1 else 0.0
+        var_b = statistics.variance(b) if n > 1 else 0.0
+        report[metric] = {
+            "mean_a": statistics.fmean(a),
+            "mean_b": statistics.fmean(b),
+            "mean_diff": mean_diff,
+            "sd_diff": sd_diff,
+            "se_diff": se,
+            "ci95": (mean_diff - Z_95 * se, mean_diff + Z_95 * se),
+            "correlation": statistics.correlation(a, b) if n > 1 and var_a and var_b else 0.0,
+            # How many times more independent pairs would be needed for the same standard error
+            "variance_reduction": (var_a + var_b) / sd_diff ** 2 if sd_diff else math.inf,
+        }
+    return report
+
+def _average(summaries):
+    return {metric: statistics.fmean(s[metric] for s in summaries) for metric in METRICS}
+
+def compare(params_a, params_b, replicates=30, days=365, seed=0, mode="crn", antithetic=False,
+            stratified=False, workers=None):
+    """Run both scenarios as paired replicates and return paired_statistics() for them."""
+    if mode not in ("crn", "independent"):
+        raise ValueError("mode must be 'crn' or 'independent'")
+    if antithetic and stratified:
+        raise ValueError("Use either antithetic or stratified replicates, not both")
+    if antithetic and replicates % 2:
+        raise ValueError("Antithetic comparisons need an even number of replicates")
+    runs = plan_runs(params_a, params_b, replicates, days, seed, mode, antithetic, stratified)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        summaries = list(pool.map(_run, runs))
+    return paired_statistics(summaries[0::2], summaries[1::2], antithetic)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two scenarios with paired replicates")
+    parser.add_argument("--a", nargs="*", default=[], help="Scenario A params, e.g. num_leos=4")
+    parser.add_argument("--b", nargs="*", default=[], help="Scenario B params, e.g. num_leos=8")
+    parser.add_argument("--replicates", type=int, default=30)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mode", choices=["crn", "independent"], default="crn")
+    parser.add_argument("--antithetic", action="store_true", help="Pair each replicate with its mirror")
+    parser.add_argument("--stratified", action="store_true", help="Stratify draws across replicates")
+    parser.add_argument("--workers", type=int, default=None, help="Simulation processes (default: CPU count)")
+    args = parser.parse_args()
+    try:
+        params_a, params_b = parse_params(args.a), parse_params(args.b)
+    except ValueError as e:
+        parser.error(str(e))
+
+    report = compare(params_a, params_b, args.replicates, args.days, args.seed, args.mode,
+                     args.antithetic, args.stratified, args.workers)
+    print(f"{'metric':<20}{'mean A':>10}{'mean B':>10}{'B - A':>10}{'95% CI':>22}{'corr':>7}{'VR':>7}")
+    for metric, row in report.items():
+        low, high = row["ci95"]
+        print(f"{metric:<20}{row['mean_a']:>10.2f}{row['mean_b']:>10.2f}{row['mean_diff']:>10.2f}"
+              f"{f'[{low:.2f}, {high:.2f}]':>22}{row['correlation']:>7.2f}{row['variance_reduction']:>7.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 # crimes.py: Define crime types, probabilities, and impacts for the simulation
+import random
 
 CRIMES = {
     "Larceny/Theft": {
@@ -62,9 +63,9 @@ TOTAL_PROBABILITY = sum(crime["probability"] for crime in CRIMES.values())
 for crime in CRIMES.values():
     crime["normalized_probability"] = crime["probability"] / TOTAL_PROBABILITY
 
-def select_crime():
-    """Select a random crime based on normalized probabilities."""
-    rand = random.random()
+def select_crime(rng=random):
+    """Select a random crime based on normalized probabilities, drawing from rng."""
+    rand = rng.random()
     cumulative = 0
     for crime_name, crime_data in CRIMES.items():
         cumulative += crime_data["normalized_probability"]
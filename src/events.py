@@ -1,151 +1,158 @@
 # events.py: Define events and random event triggers
-import random
+
+# Colony-level effects of each event as (stress, resources, civility); the batched engine reads these too
+EVENT_EFFECTS = {
+    "Power Plant Break": (20, -10, 0),
+    "Environmental Hardship": (30, -15, 0),
+    "New Settler Arrival": (15, 0, 0),
+    "Food Shortage": (25, -20, 0),
+    "Oxygen Leak": (40, -30, -10),
+    "Equipment Failure": (15, -10, 0),
+    "Meteor Threat": (30, 0, -5),
+    "Corruption Scandal": (25, 0, -15),
+    "Tech Breakthrough": (-10, 15, 0),
+    "Disease Outbreak": (20, -20, -5),
+    "Resource Discovery": (-15, 25, 0),
+    "Sabotage Attempt": (35, 0, -10),
+    "New Supply from Colony": (-20, 80, 0),  # Increased supply boost (50 + 30 from resources)
+    "Morale Boost After Fix": (-15, 0, 5),
+}
+HARDSHIP_DAYS = 14  # Environmental Hardship lasts 2 weeks
+ARRIVAL_SETTLERS = 5
+ARRIVAL_BAD_RATE = 0.15  # 15% chance new settlers are bad
+SUPPLY_SETTLERS = (5, 10)  # Settlers arriving with a colony supply run (inclusive range)
+SUPPLY_BAD_RATE = 0.1  # Lower than regular arrivals
+CORRUPTION_CHANCE = 0.3  # Chance a scandal turns any LEO corrupt
+SABOTAGE_REVEAL_CHANCE = 0.2  # Chance a sabotage exposes a hidden bad actor
 
 def trigger_random_event(model):
-    events = [
-        ("Power Plant Break", 20, lambda: power_plant_break(model)),
-        ("Environmental Hardship", 15, lambda: environmental_hardship(model)),
-        ("New Settler Arrival", 15, lambda: new_settler_arrival(model)),
-        ("Food Shortage", 10, lambda: food_shortage(model)),
-        ("Oxygen Leak", 10, lambda: oxygen_leak(model)),
-        ("Equipment Failure", 10, lambda: equipment_failure(model)),
-        ("Meteor Threat", 5, lambda: meteor_threat(model)),
-        ("Corruption Scandal", 5, lambda: corruption_scandal(model)),
-        ("Tech Breakthrough", 5, lambda: tech_breakthrough(model)),
-        ("Disease Outbreak", 5, lambda: disease_outbreak(model)),
-        ("Resource Discovery", 5, lambda: resource_discovery(model)),
-        ("Sabotage Attempt", 5, lambda: sabotage_attempt(model)),
-        ("New Supply from Colony", 5, lambda: new_supply_from_colony(model)),
-        ("Morale Boost After Fix", 5, lambda: morale_boost_after_fix(model))
-    ]
-    total_weight = sum(weight for _, weight, _ in events)
-    choice = random.uniform(0, total_weight)
+    total_weight = sum(weight for _, weight, _ in EVENTS)
+    choice = model.streams.get("event").uniform(0, total_weight)
     cumulative = 0
-    for name, weight, action in events:
+    for name, weight, action in EVENTS:
         cumulative += weight
         if choice <= cumulative:
             model.changes_log.append(f"Day {model.week}: Event - {name}")
-            action()
+            action(model)
             break
 
-def power_plant_break(model):
+def apply_effects(model, name, reason=None):
     from src.stressors import adjust_stress
+    stress, resources, civility = EVENT_EFFECTS[name]
+    adjust_stress(model, stress, reason or name)
+    model.resources += resources
+    model.civility += civility
+
+def power_plant_break(model):
     from src.model import GovernanceModel  # Dynamic import to avoid circular issues
-    adjust_stress(model, 20, "Power Plant Break - Increased visits required")
-    model.resources -= 10
+    apply_effects(model, "Power Plant Break", "Power Plant Break - Increased visits required")
     model.changes_log.append(f"Day {model.week}: Power Plant Break - Increased visits required, -10 resources")
 
 def environmental_hardship(model):
-    from src.stressors import adjust_stress
     from src.model import GovernanceModel  # Dynamic import to avoid circular issues
-    adjust_stress(model, 30, "Environmental Hardship for 2 weeks")
-    model.resources -= 15
-    model.step_count += 14  # Lasts 2 weeks (14 days)
+    apply_effects(model, "Environmental Hardship", "Environmental Hardship for 2 weeks")
+    model.step_count += HARDSHIP_DAYS
     model.changes_log.append(f"Day {model.week}: Environmental Hardship for 2 weeks, -15 resources")
 
 def new_settler_arrival(model):
-    from src.stressors import adjust_stress
     from src.model import GovernanceModel, SettlerAgent  # Dynamic import to avoid circular issues
-    adjust_stress(model, 15, "5 New Settlers Arrived")
-    for _ in range(5):  # Add 5 new settlers
-        gender = random.choice(["M", "F"])
-        is_bad = random.random() < 0.15  # 15% chance new settlers are bad
+    apply_effects(model, "New Settler Arrival", "5 New Settlers Arrived")
+    rng = model.streams.get("arrival")
+    for _ in range(ARRIVAL_SETTLERS):
+        gender = rng.choice(["M", "F"])
+        is_bad = rng.random() < ARRIVAL_BAD_RATE
         settler = SettlerAgent(model, gender, is_bad)
         model.living_agents.append(settler)  # Track in living agents
         model.agents.add(settler)
     model.changes_log.append(f"Day {model.week}: 5 New Settlers Arrived, +15 stress")
 
 def food_shortage(model):
-    from src.stressors import adjust_stress
     from src.model import GovernanceModel  # Dynamic import to avoid circular issues
-    adjust_stress(model, 25, "Food Shortage")
-    model.resources -= 20
+    apply_effects(model, "Food Shortage")
     model.changes_log.append(f"Day {model.week}: Food Shortage, -20 resources")
 
 def oxygen_leak(model):
-    from src.stressors import adjust_stress
     from src.model import GovernanceModel  # Dynamic import to avoid circular issues
-    adjust_stress(model, 40, "Oxygen Leak")
-    model.resources -= 30
-    model.civility -= 10
+    apply_effects(model, "Oxygen Leak")
     model.changes_log.append(f"Day {model.week}: Oxygen Leak, -30 resources, -10 civility")
 
 def equipment_failure(model):
-    from src.stressors import adjust_stress
     from src.hubs import HUBS  # Import HUBS dynamically for this function
     from src.model import GovernanceModel  # Dynamic import to avoid circular issues
-    adjust_stress(model, 15, "Equipment Failure")
-    model.resources -= 10
-    hub = random.choice(list(HUBS.keys()))
+    apply_effects(model, "Equipment Failure")
+    hub = model.streams.get("effect").choice(list(HUBS.keys()))
     model.changes_log.append(f"Day {model.week}: Equipment Failure at {hub}, -10 resources")
 
 def meteor_threat(model):
-    from src.stressors import adjust_stress
     from src.model import GovernanceModel  # Dynamic import to avoid circular issues
-    adjust_stress(model, 30, "Meteor Threat")
-    model.civility -= 5
+    apply_effects(model, "Meteor Threat")
     model.changes_log.append(f"Day {model.week}: Meteor Threat, -5 civility")
 
 def corruption_scandal(model):
-    from src.stressors import adjust_stress
     from src.model import GovernanceModel, LEAgent  # Dynamic import to avoid circular issues
-    adjust_stress(model, 25, "Corruption Scandal")
-    model.civility -= 15
+    apply_effects(model, "Corruption Scandal")
     for agent in model.agents:
-        if isinstance(agent, LEAgent) and random.random() < 0.3:  # 30% chance any LEO is corrupt
+        if isinstance(agent, LEAgent) and model.streams.get("effect", agent.stream_key).random() < CORRUPTION_CHANCE:
             agent.is_bad = True
     model.changes_log.append(f"Day {model.week}: Corruption Scandal, -15 civility")
 
 def tech_breakthrough(model):
-    from src.stressors import adjust_stress
     from src.model import GovernanceModel  # Dynamic import to avoid circular issues
-    adjust_stress(model, -10, "Tech Breakthrough")
-    model.resources += 15
+    apply_effects(model, "Tech Breakthrough")
     model.changes_log.append(f"Day {model.week}: Tech Breakthrough, +15 resources, -10 stress")
 
 def disease_outbreak(model):
-    from src.stressors import adjust_stress
     from src.model import GovernanceModel  # Dynamic import to avoid circular issues
-    adjust_stress(model, 20, "Disease Outbreak")
-    model.resources -= 20
-    model.civility -= 5
+    apply_effects(model, "Disease Outbreak")
     model.changes_log.append(f"Day {model.week}: Disease Outbreak, -20 resources, -5 civility")
 
 def resource_discovery(model):
-    from src.stressors import adjust_stress
     from src.model import GovernanceModel  # Dynamic import to avoid circular issues
-    adjust_stress(model, -15, "Resource Discovery")
-    model.resources += 25
+    apply_effects(model, "Resource Discovery")
     model.changes_log.append(f"Day {model.week}: Resource Discovery, +25 resources, -15 stress")
 
 def sabotage_attempt(model):
-    from src.stressors import adjust_stress
     from src.model import GovernanceModel, SettlerAgent  # Dynamic import to avoid circular issues
-    adjust_stress(model, 35, "Sabotage Attempt")
-    model.civility -= 10
+    apply_effects(model, "Sabotage Attempt")
     for agent in model.agents:
-        if isinstance(agent, SettlerAgent) and agent.is_bad and random.random() < 0.2:
+        # Every settler rolls, bad or not, so their effect streams advance alike in paired scenarios
+        if isinstance(agent, SettlerAgent) and model.streams.get("effect", agent.stream_key).random() < SABOTAGE_REVEAL_CHANCE and agent.is_bad:
             agent.revealed = True  # Reveal bad actors involved in sabotage
     model.changes_log.append(f"Day {model.week}: Sabotage Attempt, -10 civility")
 
 def new_supply_from_colony(model):
-    from src.stressors import adjust_stress
     from src.model import GovernanceModel, SettlerAgent  # Dynamic import to avoid circular issues
-    adjust_stress(model, -20, "New Supply from Colony")
-    model.resources += 80  # Increased supply boost (50 + 30 from resources)
+    apply_effects(model, "New Supply from Colony")
     # Add 5-10 new settlers
-    num_settlers = random.randint(5, 10)
+    rng = model.streams.get("arrival")
+    num_settlers = rng.randint(*SUPPLY_SETTLERS)
     for _ in range(num_settlers):
-        gender = random.choice(["M", "F"])
-        is_bad = random.random() < 0.1  # 10% chance new settlers are bad (lower than arrivals)
+        gender = rng.choice(["M", "F"])
+        is_bad = rng.random() < SUPPLY_BAD_RATE
         settler = SettlerAgent(model, gender, is_bad)
         model.living_agents.append(settler)  # Track in living agents
         model.agents.add(settler)
     model.changes_log.append(f"Day {model.week}: New Supply from Colony, +{num_settlers} settlers, +80 resources, -20 stress")
 
 def morale_boost_after_fix(model):
-    from src.stressors import adjust_stress
     from src.model import GovernanceModel  # Dynamic import to avoid circular issues
-    adjust_stress(model, -15, "Morale Boost After Fix")
-    model.civility += 5
-    model.changes_log.append(f"Day {model.week}: Morale Boost After Fix, +5 civility, -15 stress")
\ No newline at end of file
+    apply_effects(model, "Morale Boost After Fix")
+    model.changes_log.append(f"Day {model.week}: Morale Boost After Fix, +5 civility, -15 stress")
+
+# Weekly events: (name, relative weight, handler)
+EVENTS = [
+    ("Power Plant Break", 20, power_plant_break),
+    ("Environmental Hardship", 15, environmental_hardship),
+    ("New Settler Arrival", 15, new_settler_arrival),
+    ("Food Shortage", 10, food_shortage),
+    ("Oxygen Leak", 10, oxygen_leak),
+    ("Equipment Failure", 10, equipment_failure),
+    ("Meteor Threat", 5, meteor_threat),
+    ("Corruption Scandal", 5, corruption_scandal),
+    ("Tech Breakthrough", 5, tech_breakthrough),
+    ("Disease Outbreak", 5, disease_outbreak),
+    ("Resource Discovery", 5, resource_discovery),
+    ("Sabotage Attempt", 5, sabotage_attempt),
+    ("New Supply from Colony", 5, new_supply_from_colony),
+    ("Morale Boost After Fix", 5, morale_boost_after_fix)
+]
\ No newline at end of file
@@ -0,0 +1,115 @@
+# export.py: Render recorded runs to an image sequence or raw frame stream without a window
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Must be set before pygame opens a display
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # Keep stdout clean for raw frame streams
+import argparse
+import itertools
+import random
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+WIDTH, HEIGHT = 800, 600  # Same size as the live window in visualize.py
+FPS = 30  # Same frame rate as the live window
+PNG_CHUNK_FRAMES = 300  # PNG workers write to disk and return nothing
+RAW_CHUNK_FRAMES = 15  # Raw chunks come back to the parent, ~21 MB each
+MAX_CHUNKS_PER_WORKER = 2  # Bounds rendered-but-unwritten chunks when the consumer is slow
+
+def record_frames(days, seed=None):
+    """Simulate a run headlessly and yield one snapshot per animation frame, a day at a time."""
+    from src.model import GovernanceModel
+    from src.visualize import snapshot  # Imported lazily so workers only open the dummy display once
+    if seed is not None:
+        random.seed(seed)
+    model = GovernanceModel()
+    yield snapshot(model)  # Opening frame before the first turn
+    for _ in range(days):
+        day_frames = []
+        model.run_day(on_frame=lambda m: day_frames.append(snapshot(m)))
+        yield from day_frames
+
+def trajectory_frames(path):
+    """Yield frames for a run saved with main.py --record, animating each day's moves over FPS frames."""
+    from src.trajectory import Trajectory
+    trajectory = Trajectory.load(path)
+    states = trajectory.states_at(0)
+    yield trajectory.frame(0, states)  # Opening frame, as in record_frames()
+    for day in range(1, len(trajectory)):
+        start = trajectory.layout(states)
+        states = trajectory.states_at(day)
+        for step in range(1, FPS + 1):
+            yield trajectory.frame(day, states, start, step / FPS)
+
+def _render_chunk(job):
+    # Worker: draw a contiguous range of frames offscreen, write PNGs or return raw RGB bytes
+    start, frames, out_dir = job
+    import pygame
+    from src.visualize import render
+    surface = pygame.Surface((WIDTH, HEIGHT))
+    raw = []
+    for offset, frame in enumerate(frames):
+        render(surface, frame)
+        if out_dir:
+            pygame.image.save(surface, os.path.join(out_dir, f"frame_{start + offset:06d}.png"))
+        else:
+            raw.append(pygame.image.tostring(surface, "RGB"))
+    return b"".join(raw)
+
+def export_frames(frames, out_dir=None, stream=None, workers=None, chunk_size=None):
+    """Render frames (any iterable, consumed one chunk at a time) across a process pool, split by frame range.
+
+    With out_dir, writes frame_000000.png, frame_000001.png, ... into it.
+    With stream, writes raw rgb24 frames in order (e.g. to pipe into ffmpeg).
+    """
+    if (out_dir is None) == (stream is None):
+        raise ValueError("Pass exactly one of out_dir or stream")
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or (PNG_CHUNK_FRAMES if out_dir else RAW_CHUNK_FRAMES)
+    frames = iter(frames)
+    count = 0
+    pending = deque()  # Futures in frame order; at most MAX_CHUNKS_PER_WORKER per worker in flight
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while chunk := list(itertools.islice(frames, chunk_size)):
+            if len(pending) >= MAX_CHUNKS_PER_WORKER * workers:  # Wait for the oldest chunk before rendering more
+                _write_chunk(pending.popleft().result(), stream)
+            pending.append(pool.submit(_render_chunk, (count, chunk, out_dir)))
+            count += len(chunk)
+        while pending:
+            _write_chunk(pending.popleft().result(), stream)
+    return count
+
+def _write_chunk(data, stream):
+    if stream:
+        stream.write(data)
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a headless run to frames for video export")
+    parser.add_argument("--days", type=int, default=365, help="Number of simulated days to record")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for a reproducible run")
+    parser.add_argument("--trajectory", default=None,
+                        help="Render a run saved with main.py --record instead of simulating a new one")
+    parser.add_argument("--out", default=None, help="Directory for the PNG image sequence")
+    parser.add_argument("--raw", default=None, help="File for raw rgb24 frames, '-' for stdout")
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: CPU count)")
+    args = parser.parse_args()
+    if (args.out is None) == (args.raw is None):
+        parser.error("Pass exactly one of --out or --raw")
+
+    if args.trajectory:
+        frames = trajectory_frames(args.trajectory)
+    else:
+        frames = record_frames(args.days, args.seed)
+    if args.out:
+        count = export_frames(frames, out_dir=args.out, workers=args.workers)
+    elif args.raw == "-":
+        count = export_frames(frames, stream=sys.stdout.buffer, workers=args.workers)
+    else:
+        with open(args.raw, "wb") as stream:
+            count = export_frames(frames, stream=stream, workers=args.workers)
+    # Report on stderr so stdout stays clean when streaming raw frames
+    print(f"Rendered {count} frames ({WIDTH}x{HEIGHT} @ {FPS} FPS)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -22,4 +22,7 @@ def get_hub_risk(hub_name):
     return HUBS[hub_name]["risk"]
 
 def get_hub_purpose(hub_name):
-    return HUBS[hub_name]["purpose"]
\ No newline at end of file
+    return HUBS[hub_name]["purpose"]
+
+def get_nearest_hub(pos):
+    return min(HUBS, key=lambda name: (HUBS[name]["pos"][0] - pos[0]) ** 2 + (HUBS[name]["pos"][1] - pos[1]) ** 2)
@@ -1,6 +1,15 @@
+import argparse
 from src.model import GovernanceModel
-from src.visualize import run
+from src.visualize import run, replay
 
 if __name__ == "__main__":
-    model = GovernanceModel()
-    run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Space Governance Sim")
+    parser.add_argument("--record", default=None, help="Save a per-day trajectory to this file on exit")
+    parser.add_argument("--replay", default=None, help="Play back a saved trajectory instead of simulating")
+    parser.add_argument("--network", default=None, help="Write contacts.csv and crimes.csv to this directory on exit")
+    args = parser.parse_args()
+    if args.replay:
+        replay(args.replay)
+    else:
+        model = GovernanceModel()
+        run(record_path=args.record, network_dir=args.network)
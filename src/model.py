@@ -1,10 +1,21 @@
 import pygame  # Added to fix NameError
 from mesa import Agent, Model
-import random
-from src.hubs import HUBS
+import csv
+import os
+from src.hubs import HUBS, get_nearest_hub
 from src.events import trigger_random_event
 from src.stressors import adjust_stress, STRESS_EVENTS
 from src.crimes import select_crime, apply_crime_impact
+from src.trajectory import TrajectoryRecorder
+from src.streams import RandomStreams
+
+# Daily hub choices for settlers
+BAD_ACTOR_HUBS = ["Housing District", "Entertainment District", "Power Plant", "Mining Outpost", "Prison Hub"]
+BAD_ACTOR_HUB_WEIGHTS = [0.3, 0.2, 0.2, 0.2, 0.1]  # Bias toward Housing, less to Prison
+SETTLER_HUBS = ["Housing District", "Farming Module", "Factory", "Water Treatment", "Command Center", 
+                "Gym/Recreation", "Medical Bay", "Entertainment District", "Power Plant", "Research Lab", 
+                "Mining Outpost"]
+SETTLER_HUB_WEIGHTS = [0.5, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.05, 0.05, 0.05]  # Strong bias toward Housing
 
 class SettlerAgent(Agent):
     def __init__(self, model, gender, is_bad=False):
@@ -12,42 +23,46 @@ class SettlerAgent(Agent):
         self.gender = gender  # "M" for men (squares), "F" for women (circles/dots)
         self.is_bad = is_bad  # Bad actor flag
         self.revealed = False if is_bad else True  # Hidden bad actors
-        self.pos = HUBS[random.choice(list(HUBS.keys()))]["pos"]  # Start at a random hub
+        self.stream_key = model.next_stream_key("settler")  # Keys this person's random streams
+        rng = model.streams.get("init", self.stream_key)
+        self.pos = HUBS[rng.choice(list(HUBS.keys()))]["pos"]  # Start at a random hub
         self.target_hub = None  # Will be set each turn
         self.start_pos = None  # Starting position for animation
         self.animation_frames = 30  # Number of frames for animation (1 second at 30 FPS)
         self.animation_frame = 0  # Current animation frame
-        self.power = sum(random.randint(1, 6) for _ in range(3))  # 3d6 roll (3-18)
+        self.power = sum(rng.randint(1, 6) for _ in range(3))  # 3d6 roll (3-18)
+        self.person_id = self.unique_id  # Stable identity kept through prison and death
 
     def step(self, animate=False):
         if not animate:  # Initialize movement for next turn
-            if self.target_hub is None or random.random() < 0.1:  # 10% chance to stay at current hub
+            rng = self.model.streams.get("hub", self.stream_key)
+            if self.target_hub is None or rng.random() < 0.1:  # 10% chance to stay at current hub
                 # Choose new target hub with bias toward Housing District
                 if self.is_bad and self.revealed:
-                    hubs = ["Housing District", "Entertainment District", "Power Plant", "Mining Outpost", "Prison Hub"]
-                    weights = [0.3, 0.2, 0.2, 0.2, 0.1]  # Bias toward Housing, less to Prison
+                    hubs, weights = BAD_ACTOR_HUBS, BAD_ACTOR_HUB_WEIGHTS
                 else:
-                    hubs = ["Housing District", "Farming Module", "Factory", "Water Treatment", "Command Center", 
-                            "Gym/Recreation", "Medical Bay", "Entertainment District", "Power Plant", "Research Lab", 
-                            "Mining Outpost"]
-                    weights = [0.5, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1, 0.05, 0.05, 0.05]  # Strong bias toward Housing
-                self.target_hub = random.choices(hubs, weights=weights, k=1)[0]
+                    hubs, weights = SETTLER_HUBS, SETTLER_HUB_WEIGHTS
+                self.target_hub = rng.choices(hubs, weights=weights, k=1)[0]
             self.start_pos = self.pos
             self.animation_frame = 0
+            # Crime rolls are drawn every day, whatever happens, so paired scenarios stay in step
+            rng = self.model.streams.get("crime", self.stream_key)
+            crime_roll = rng.random()
+            crime_name, crime_data = select_crime(rng)
+            victim_roll = rng.random()
             # Check for crime if bad actor and revealed
             if self.is_bad and self.revealed:
-                nearby_agents = [other for other in self.model.agents if isinstance(other, SettlerAgent) and other != self and 
-                                abs(other.pos[0] - self.pos[0]) < 50 and abs(other.pos[1] - self.pos[1]) < 50]
-                nearby_leas = [other for other in self.model.agents if isinstance(other, LEAgent) and 
-                              abs(other.pos[0] - self.pos[0]) < 50 and abs(other.pos[1] - self.pos[1]) < 50]
+                colocated = self.model.colocated(self)  # Everyone sharing this agent's hub today
+                nearby_agents = [other for other in colocated if isinstance(other, SettlerAgent)]
+                nearby_leas = [other for other in colocated if isinstance(other, LEAgent)]
                 if nearby_agents and not nearby_leas:  # Weaker people present, no LEAs nearby
                     weaker_agents = [agent for agent in nearby_agents if agent.power < self.power]
-                    if weaker_agents and random.random() < 0.1:  # 10% chance to commit a crime if conditions met
-                        crime_name, crime_data = select_crime()
+                    if weaker_agents and crime_roll < 0.1:  # 10% chance to commit a crime if conditions met
                         apply_crime_impact(self.model, crime_name, crime_data)
+                        victim = weaker_agents[min(int(victim_roll * len(weaker_agents)), len(weaker_agents) - 1)]
+                        self.model.record_crime(self, victim, crime_name)
                         # Optionally handle victim or other effects (e.g., death for murder)
                         if crime_name == "Murder/Nonnegligent Manslaughter":
-                            victim = random.choice(weaker_agents)
                             self.model.handle_death(victim, "Murder by bad actor")
         else:  # Animate movement
             if self.animation_frame < self.animation_frames:
@@ -68,13 +83,13 @@ class SettlerAgent(Agent):
                 # Check if agent "touches" the target hub (within 20 pixels) to trigger stat changes
                 if abs(self.pos[0] - target_x) <= 20 and abs(self.pos[1] - target_y) <= 20:
                     if self.target_hub in ["Farming Module", "Factory", "Water Treatment", "Command Center"]:
-                        self.model.resources = min(200, self.model.resources + random.randint(1, 3))  # Cap resources at 200, increase by 1-3
+                        self.model.resources = min(200, self.model.resources + self.model.streams.get("visit", self.stream_key).randint(1, 3))  # Cap resources at 200, increase by 1-3
                     elif self.target_hub in ["Gym/Recreation", "Entertainment District"]:
                         self.reduce_stress()
 
     def reduce_stress(self):
         # Reduce stress when visiting morale-boosting hubs
-        if self.target_hub in ["Gym/Recreation", "Entertainment District"] and random.random() < 0.1:
+        if self.target_hub in ["Gym/Recreation", "Entertainment District"] and self.model.streams.get("visit", self.stream_key).random() < 0.1:
             adjust_stress(self.model, -5, "Agent visited morale hub")
 
 class PrisonAgent(Agent):
@@ -85,14 +100,16 @@ class PrisonAgent(Agent):
         self.original_gender = original_agent.gender  # Store original gender for visualization
         self.is_bad = original_agent.is_bad  # Retain bad actor status
         self.target_hub = "Prison Hub"  # Stay at prison
-        self.start_pos = None  # Starting position for animation
+        self.start_pos = self.pos  # Starting position for animation (may be created mid-turn)
         self.animation_frames = 30  # Number of frames for animation (1 second at 30 FPS)
         self.animation_frame = 0  # Current animation frame
         self.power = original_agent.power  # Retain original power
+        self.person_id = original_agent.person_id  # Same person as the original agent
+        self.stream_key = original_agent.stream_key
 
     def step(self, animate=False):
         if not animate:  # Initialize movement for next turn
-            if random.random() < 0.1:  # 10% chance to stay, otherwise move within prison
+            if self.model.streams.get("hub", self.stream_key).random() < 0.1:  # 10% chance to stay, otherwise move within prison
                 self.target_hub = "Prison Hub"
             self.start_pos = self.pos
             self.animation_frame = 0
@@ -120,14 +137,16 @@ class DeadAgent(Agent):
         self.is_dead = True
         self.original_gender = original_agent.gender  # Store original gender for visualization
         self.target_hub = "Morgue"  # Stay at morgue
-        self.start_pos = None  # Starting position for animation
+        self.start_pos = self.pos  # Starting position for animation (may be created mid-turn)
         self.animation_frames = 30  # Number of frames for animation (1 second at 30 FPS)
         self.animation_frame = 0  # Current animation frame
         self.power = original_agent.power  # Retain original power
+        self.person_id = original_agent.person_id  # Same person as the original agent
+        self.stream_key = original_agent.stream_key
 
     def step(self, animate=False):
         if not animate:  # Initialize movement for next turn
-            if random.random() < 0.1:  # 10% chance to stay, otherwise move within morgue
+            if self.model.streams.get("hub", self.stream_key).random() < 0.1:  # 10% chance to stay, otherwise move within morgue
                 self.target_hub = "Morgue"
             self.start_pos = self.pos
             self.animation_frame = 0
@@ -152,14 +171,17 @@ class LEAgent(Agent):
     def __init__(self, model, is_bad=False):
         super().__init__(model)
         self.is_bad = is_bad  # Corrupt LEO chance (e.g., 5%)
-        self.gender = "M" if random.random() < 0.9 else "F"  # 90% male, 10% female for LEOs
-        self.pos = HUBS[random.choice(list(HUBS.keys()))]["pos"]  # Start at a random hub
+        self.stream_key = model.next_stream_key("leo")  # Keys this person's random streams
+        rng = model.streams.get("init", self.stream_key)
+        self.gender = "M" if rng.random() < 0.9 else "F"  # 90% male, 10% female for LEOs
+        self.pos = HUBS[rng.choice(list(HUBS.keys()))]["pos"]  # Start at a random hub
         self.patrol_index = 0  # Track current patrol hub
         self.chasing = None  # Track if chasing a bad actor
         self.start_pos = None  # Starting position for animation
         self.animation_frames = 30  # Number of frames for animation (1 second at 30 FPS)
         self.animation_frame = 0  # Current animation frame
-        self.power = sum(random.randint(1, 6) for _ in range(3))  # 3d6 roll (3-18)
+        self.power = sum(rng.randint(1, 6) for _ in range(3))  # 3d6 roll (3-18)
+        self.person_id = self.unique_id  # Stable identity for trajectory recording
 
     def step(self, animate=False):
         if not animate:  # Initialize movement for next turn
@@ -218,15 +240,16 @@ class LEAgent(Agent):
                     # Check for bad actors acting violently to initiate chase
                     for agent in self.model.agents:
                         if isinstance(agent, SettlerAgent) and agent.is_bad and agent.revealed:
-                            nearby_agents = [other for other in self.model.agents if isinstance(other, SettlerAgent) and other != agent and 
-                                            abs(other.pos[0] - agent.pos[0]) < 50 and abs(other.pos[1] - agent.pos[1]) < 50]
-                            if len(nearby_agents) < 2 and random.random() < 0.05:  # Reduced to 5% for slower population drop
+                            nearby_agents = [other for other in self.model.colocated(agent, current=True) if isinstance(other, SettlerAgent)]
+                            if len(nearby_agents) < 2 and self.model.streams.get("chase", self.stream_key).random() < 0.05:  # Reduced to 5% for slower population drop
                                 self.chasing = agent  # Start chasing this bad actor
                                 break
 
 class GovernanceModel(Model):
-    def __init__(self):
+    def __init__(self, record=False, num_settlers=40, num_leos=4, bad_actor_rate=0.1, corrupt_leo_rate=0.05,
+                 track_contacts=False, streams=None):
         super().__init__()
+        self.streams = streams or RandomStreams()  # Per-site random streams; share a seed to pair scenarios
         self.civility = 50
         self.resources = 100  # Initial resources, cap at 200
         self.week = 0  # Now represents days in turn-based system
@@ -240,30 +263,44 @@ class GovernanceModel(Model):
         self.stress = 0  # New stress metric (0-100)
         self.morgue_count = 0  # Counter for dead agents in Morgue
         self.prison_count = 0  # Counter for imprisoned agents in Prison
+        self.hub_occupancy = {}  # Hub name -> agents there today, rebuilt each turn
+        self.agent_hubs = {}  # Agent -> hub name today
+        self.contacts = {} if track_contacts else None  # (person_id, person_id) -> days spent at the same hub
+        self.crime_log = []  # (day, offender person_id, victim person_id, crime, hub)
+        self.arrivals = {"settler": 0, "leo": 0}  # People of each kind created so far
 
         # Update HUBS to include Morgue (moved further away)
         HUBS["Morgue"] = {"pos": (750, 350), "risk": 0.1, "purpose": "absorbing"}  # Far right, near center, moved right 50
 
         # Create agents with unique IDs assigned by Mesa, double initial population
         self.living_agents = []  # Track all living agents (settlers + LEOs)
-        for i in range(40):  # Double settlers to 40
-            gender = "M" if i < 20 else "F"  # Half men, half women
-            is_bad = random.random() < 0.1  # 10% bad actors
+        rng = self.streams.get("init")
+        for i in range(num_settlers):  # Double settlers to 40 by default
+            gender = "M" if i < num_settlers // 2 else "F"  # Half men, half women
+            is_bad = rng.random() < bad_actor_rate  # 10% bad actors by default
             agent = SettlerAgent(self, gender, is_bad)
             self.living_agents.append(agent)
             self.agents.add(agent)
-        for i in range(4):  # Double LEOs to 4
-            is_bad = random.random() < 0.05  # 5% chance of corrupt LEO
+        for i in range(num_leos):  # Double LEOs to 4 by default
+            is_bad = rng.random() < corrupt_leo_rate  # 5% chance of corrupt LEO by default
             le_agent = LEAgent(self, is_bad)
             self.living_agents.append(le_agent)
             self.agents.add(le_agent)
 
+        self.build_colocation(count_contacts=False)  # Day 1 counts these positions when it starts
+
+        # Optional per-day recording for the replay viewer
+        self.trajectory = TrajectoryRecorder() if record else None
+        if self.trajectory:
+            self.trajectory.record(self)  # Day 0
+
     def step(self):
         if (self.is_manual and not self.is_animating and pygame.mouse.get_pressed()[0]) or (not self.is_manual and not self.is_animating):  # Manual click or auto mode
             self.is_animating = True
             self.animation_frame = 0
+            self.build_colocation()  # Everyone still stands where yesterday's move took them
             # Initialize movement for all agents
-            for agent in self.agents:
+            for agent in list(self.agents):  # Murders add DeadAgents while iterating
                 agent.step(animate=False)
 
     def animate_step(self):
@@ -273,29 +310,34 @@ class GovernanceModel(Model):
                 self.is_animating = False
                 self.week += 1  # Advance one day
                 self.step_count += 1
+                moving_agents = list(self.agents)  # Agents added by events below start moving next turn
                 if self.week % 7 == 0:  # Trigger a random event every 7 days (weekly)
                     self.trigger_random_event()
                 self.reduce_stress_over_time()  # Reduce stress based on conditions
                 self.changes_log.append(f"Day {self.week}: Civility {self.civility}, Resources {self.resources}, Stress {self.stress}, Population {len(self.living_agents)}, Morgue {self.morgue_count}, Prison {self.prison_count}")
 
                 # Complete movement and handle effects
-                for agent in list(self.agents):  # Use list to modify agents during iteration
+                for agent in moving_agents:  # Use list to modify agents during iteration
                     agent.step(animate=True)
                     if isinstance(agent, SettlerAgent):
+                        # Draw every roll before testing any condition so paired scenarios stay in step
+                        death_rng = self.streams.get("death", agent.stream_key)
+                        medical_roll, repair_roll = death_rng.random(), death_rng.random()
+                        turn_roll = self.streams.get("turn", agent.stream_key).random()
                         # Check for stress-induced bad behavior (slower transition)
-                        if not agent.is_bad and random.random() < (self.stress / 2000):  # Reduced to 0.05% per stress point
+                        if not agent.is_bad and turn_roll < (self.stress / 2000):  # Reduced to 0.05% per stress point
                             agent.is_bad = True
                             agent.revealed = False  # Starts as hidden (orange)
                             adjust_stress(self, 5, "Good actor turned bad due to stress")
                         # Check for death at Medical Bay (reduced to 0.3%)
                         if agent.target_hub == "Medical Bay":
                             hub_pos = HUBS["Medical Bay"]["pos"]
-                            if abs(agent.pos[0] - hub_pos[0]) <= 20 and abs(agent.pos[1] - hub_pos[1]) <= 20 and random.random() < 0.003:
+                            if abs(agent.pos[0] - hub_pos[0]) <= 20 and abs(agent.pos[1] - hub_pos[1]) <= 20 and medical_roll < 0.003:
                                 self.handle_death(agent, "Medical complications")
                         # Check for death at damaged hubs after adverse events (reduced to 1%)
                         if self.week % 7 < 1 and agent.target_hub in ["Power Plant", "Factory", "Mining Outpost"]:  # Check first day of week
                             hub_pos = HUBS[agent.target_hub]["pos"]
-                            if abs(agent.pos[0] - hub_pos[0]) <= 20 and abs(agent.pos[1] - hub_pos[1]) <= 20 and random.random() < 0.01:
+                            if abs(agent.pos[0] - hub_pos[0]) <= 20 and abs(agent.pos[1] - hub_pos[1]) <= 20 and repair_roll < 0.01:
                                 self.handle_death(agent, "Risky repair at damaged hub")
                         # Check for incidents with weaker, isolated settlers (handled in crimes.py now)
 
@@ -309,15 +351,91 @@ class GovernanceModel(Model):
                 adjust_stress(self, -0.1, "Natural stress decay")
                 # Update metrics
                 self.update_metrics()
+                if self.trajectory:
+                    self.trajectory.record(self)
             else:
                 # Animate all agents
                 for agent in self.agents:
                     agent.step(animate=True)
 
+    def run_day(self, on_frame=None):
+        # Play out one full day without a window (auto mode), calling on_frame after every animation frame
+        self.is_manual = False
+        self.step()
+        while self.is_animating:
+            self.animate_step()
+            if on_frame:
+                on_frame(self)
+
+    def next_stream_key(self, kind):
+        # The n-th settler (or LEO) gets the same streams in every paired scenario, however many
+        # LEOs, prisoners or deaths the scenarios differ by, because each kind counts on its own
+        self.arrivals[kind] += 1
+        return (kind, self.arrivals[kind])
+
+    def hub_of(self, agent):
+        # Hub an agent occupies: where its last move was headed, or the hub nearest to where it stands
+        target_hub = getattr(agent, "target_hub", None)  # LEOs have none before their first turn or while chasing
+        return target_hub if target_hub in HUBS else get_nearest_hub(agent.pos)
+
+    def build_colocation(self, count_contacts=True):
+        # Group agents by hub in one pass over the population; co-location lookups then only touch one hub.
+        # Counting happens once per day, at its start, so N days add N to a pair that never parts.
+        self.hub_occupancy = {}
+        self.agent_hubs = {}
+        for agent in self.agents:
+            hub = self.hub_of(agent)
+            self.hub_occupancy.setdefault(hub, []).append(agent)
+            self.agent_hubs[agent] = hub
+        if count_contacts and self.contacts is not None:
+            for occupants in self.hub_occupancy.values():
+                people = sorted(a.person_id for a in occupants if not isinstance(a, DeadAgent))
+                for i, first in enumerate(people):
+                    for second in people[i + 1:]:
+                        self.contacts[(first, second)] = self.contacts.get((first, second), 0) + 1
+
+    def colocated(self, agent, current=False):
+        # Other agents sharing this agent's hub today. current=True looks at where everyone is after
+        # today's moves instead of the start-of-day grouping (slower: scans the whole population)
+        if current:
+            hub = self.hub_of(agent)
+            return [other for other in self.agents if other is not agent and self.hub_of(other) == hub]
+        hub = self.agent_hubs.get(agent)
+        return [other for other in self.hub_occupancy.get(hub, []) if other is not agent]
+
+    def record_crime(self, offender, victim, crime_name):
+        self.crime_log.append((self.week, offender.person_id, victim.person_id, crime_name, self.agent_hubs.get(offender)))
+
+    def export_contacts(self, path):
+        # Write the accumulated contact network as an edge list (requires track_contacts=True)
+        if self.contacts is None:
+            raise ValueError("Contacts are only collected with GovernanceModel(track_contacts=True)")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["person_a", "person_b", "days_together"])
+            for (first, second), days in sorted(self.contacts.items()):
+                writer.writerow([first, second, days])
+
+    def export_crimes(self, path):
+        # Write who victimized whom, when and where, to pair with the contact network
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["day", "offender", "victim", "crime", "hub"])
+            writer.writerows(self.crime_log)
+
+    def export_network(self, directory):
+        # Write contacts.csv and crimes.csv for this run into a directory (requires track_contacts=True)
+        os.makedirs(directory, exist_ok=True)
+        self.export_contacts(os.path.join(directory, "contacts.csv"))
+        self.export_crimes(os.path.join(directory, "crimes.csv"))
+
     def handle_death(self, agent, reason):
         if agent in self.living_agents:
             self.living_agents.remove(agent)
             self.agents.remove(agent)
+            hub = self.agent_hubs.pop(agent, None)
+            if hub is not None:
+                self.hub_occupancy[hub].remove(agent)  # The dead no longer count as company
             dead_agent = DeadAgent(self, agent)
             self.agents.add(dead_agent)
             self.morgue_count += 1  # Increment morgue counter
@@ -330,9 +448,11 @@ class GovernanceModel(Model):
 
     def reduce_stress_over_time(self):
         # Reduce stress if civility is high or no incidents recently
-        if self.civility >= 70 and random.random() < 0.2:
+        rng = self.streams.get("stress")
+        civility_roll, calm_roll = rng.random(), rng.random()  # Drawn every day so paired scenarios stay in step
+        if self.civility >= 70 and civility_roll < 0.2:
             adjust_stress(self, -5, "High civility reduces stress")
-        if len([log for log in self.changes_log[-7:] if "Incident" in log]) == 0 and self.week > 7 and random.random() < 0.1:  # Check last week
+        if len([log for log in self.changes_log[-7:] if "Incident" in log]) == 0 and self.week > 7 and calm_roll < 0.1:  # Check last week
             adjust_stress(self, -10, "Long time without incidents reduces stress")
 
     def update_metrics(self):
@@ -0,0 +1,71 @@
+# runner.py: Headless simulation runs for scripts, batch jobs and comparisons
+import random
+from src.model import GovernanceModel
+from src.streams import RandomStreams
+
+# GovernanceModel keyword arguments that scenarios may set
+MODEL_PARAMS = {
+    "num_settlers": int,
+    "num_leos": int,
+    "bad_actor_rate": float,
+    "corrupt_leo_rate": float,
+}
+
+# Accepted range (inclusive) for each scenario param
+MODEL_PARAM_LIMITS = {
+    "num_settlers": (0, 1000),
+    "num_leos": (0, 100),
+    "bad_actor_rate": (0.0, 1.0),
+    "corrupt_leo_rate": (0.0, 1.0),
+}
+
+def parse_params(pairs):
+    # "num_leos=8" style arguments -> GovernanceModel keyword arguments
+    params = {}
+    for pair in pairs:
+        name, _, value = pair.partition("=")
+        if name not in MODEL_PARAMS:
+            raise ValueError(f"Unknown param {name!r}, expected one of: {', '.join(MODEL_PARAMS)}")
+        params[name] = MODEL_PARAMS[name](value)
+        low, high = MODEL_PARAM_LIMITS[name]
+        if not low <= params[name] <= high:
+            raise ValueError(f"{name} must be between {low} and {high}")
+    return params
+
+def daily_metrics(model):
+    """Colony-level metrics for the current day."""
+    return {
+        "day": model.week,
+        "civility": model.civility,
+        "resources": model.resources,
+        "stress": model.stress,
+        "conflict_rate": model.conflict_rate,
+        "population": len(model.living_agents),
+        "morgue": model.morgue_count,
+        "prison": model.prison_count,
+    }
+
+def summarize(series):
+    """Final-day metrics plus run averages for one time series."""
+    summary = dict(series[-1])
+    summary["mean_stress"] = sum(row["stress"] for row in series) / len(series)
+    summary["mean_conflict_rate"] = sum(row["conflict_rate"] for row in series) / len(series)
+    return summary
+
+def simulate(seed, days, params=None, streams=None, network_dir=None):
+    """Run one seeded colony for a number of days without a window.
+
+    streams optionally holds RandomStreams keyword arguments (seed, antithetic, stratum, strata)
+    to pin the per-site random streams, e.g. to pair the run with another scenario. network_dir,
+    if given, receives the run's contacts.csv and crimes.csv.
+    """
+    random.seed(seed)
+    model = GovernanceModel(**(params or {}), track_contacts=network_dir is not None,
+                            streams=RandomStreams(**streams) if streams else None)
+    series = [daily_metrics(model)]
+    for _ in range(days):
+        model.run_day()
+        series.append(daily_metrics(model))
+    if network_dir is not None:
+        model.export_network(network_dir)
+    return {"seed": seed, "summary": summarize(series), "series": series}
@@ -0,0 +1,304 @@
+# service.py: Local HTTP job service that queues, dedupes, runs and caches scenario batches
+import argparse
+import asyncio
+import glob
+import hashlib
+import json
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from src.runner import MODEL_PARAMS, MODEL_PARAM_LIMITS, simulate
+
+MAX_DAYS = 3650  # Ten simulated years per run
+MAX_SEEDS = 1000
+SERIES_CHUNK_BYTES = 1 << 20  # Streamed series are read from disk in 1 MB chunks
+MAX_BODY_BYTES = 1 << 20  # Scenarios are small; refuse anything larger than 1 MB
+
+HTTP_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+
+def _source_version():
+    # Hash of the simulation sources, so cached results are never served after a code change
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), "*.py"))):
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+MODEL_VERSION = _source_version()
+
+def _number(name, value, kind, low, high):
+    # JSON numbers only: no strings, booleans, NaN/inf, fractional counts or out-of-range values
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"{name} must be a finite number")
+    if kind is int:
+        if value != int(value):
+            raise ValueError(f"{name} must be a whole number")
+        value = int(value)
+    else:
+        value = float(value)
+    if not low <= value <= high:
+        raise ValueError(f"{name} must be between {low} and {high}")
+    return value
+
+def normalize_scenario(data):
+    """Validate a submitted scenario and return it in canonical form, raising ValueError if invalid."""
+    if not isinstance(data, dict):
+        raise ValueError("Scenario must be a JSON object")
+    params = data.get("params", {})
+    if not isinstance(params, dict):
+        raise ValueError("params must be an object")
+    unknown = sorted(set(params) - set(MODEL_PARAMS))
+    if unknown:
+        raise ValueError(f"Unknown params: {', '.join(unknown)}")
+    params = {name: _number(name, value, MODEL_PARAMS[name], *MODEL_PARAM_LIMITS[name])
+              for name, value in sorted(params.items())}
+    seeds = data.get("seeds", [0])
+    if not isinstance(seeds, list) or not all(isinstance(s, int) and not isinstance(s, bool) for s in seeds):
+        raise ValueError("seeds must be a list of integers")
+    if not 1 <= len(seeds) <= MAX_SEEDS:
+        raise ValueError(f"seeds must list 1 to {MAX_SEEDS} seeds")
+    days = _number("days", data.get("days", 365), int, 1, MAX_DAYS)
+    return {"params": params, "seeds": sorted(set(seeds)), "days": days}
+
+def scenario_key(scenario):
+    """Stable hash of a canonical scenario and the model version, used as job id and cache key."""
+    encoded = json.dumps({"model_version": MODEL_VERSION, **scenario}, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+def _run_seed(seed, days, params, path):
+    # Runs in a worker: spools the series to disk and hands only the summary back
+    result = simulate(seed, days, params)
+    with open(path, "w", encoding="utf-8") as f:
+        for row in result["series"]:
+            f.write(json.dumps({"seed": seed, **row}) + "\n")
+    return {"seed": seed, **result["summary"]}
+
+class Job:
+    def __init__(self, job_id, scenario):
+        self.id = job_id
+        self.scenario = scenario
+        self.status = "queued"  # queued -> running -> done | failed
+        self.summaries = []  # One summary per seed; the series stay on disk at series_path
+        self.series_path = None
+        self.error = None
+        self.finished = asyncio.Event()
+
+    def describe(self, with_summaries=False):
+        info = {"id": self.id, "status": self.status, "scenario": self.scenario}
+        if self.error:
+            info["error"] = self.error
+        if with_summaries and self.status == "done":
+            info["summaries"] = self.summaries
+        return info
+
+class JobService:
+    """Queue of scenario jobs executed on a bounded process pool, deduped and cached by scenario hash.
+
+    Finished series live in the cache directory (a temporary one when caching is disabled), so
+    memory only holds job summaries.
+    """
+
+    def __init__(self, workers=None, cache_dir=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        self.jobs = {}
+        self.queue = asyncio.Queue()
+        self.pool = None
+        self._dispatchers = []
+        self._spool = None
+
+    async def start(self):
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        if self.cache_dir:
+            self.data_dir = os.path.join(self.cache_dir, MODEL_VERSION)
+        else:
+            self._spool = tempfile.TemporaryDirectory(prefix="sim_jobs_")
+            self.data_dir = self._spool.name
+        os.makedirs(self.data_dir, exist_ok=True)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self.pool.shutdown(cancel_futures=True)
+        if self._spool:
+            self._spool.cleanup()
+
+    def submit(self, data):
+        scenario = normalize_scenario(data)
+        job_id = scenario_key(scenario)
+        job = self.jobs.get(job_id)
+        if job is not None and job.status != "failed":  # Identical scenario already queued, running or done
+            return job
+        job = Job(job_id, scenario)  # New scenarios and retries of failed ones
+        self.jobs[job_id] = job
+        if self._load_cached(job):
+            job.status = "done"
+            job.finished.set()
+        else:
+            self.queue.put_nowait(job)
+        return job
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            job.status = "running"
+            scenario = job.scenario
+            parts = [self._cache_path(job.id, f"{i}.part") for i in range(len(scenario["seeds"]))]
+            try:
+                # Wait for every seed, even after one fails, so no worker is still writing a part file below
+                results = await asyncio.gather(*[
+                    loop.run_in_executor(self.pool, _run_seed, seed, scenario["days"], scenario["params"], part)
+                    for seed, part in zip(scenario["seeds"], parts)
+                ], return_exceptions=True)
+                errors = [result for result in results if isinstance(result, BaseException)]
+                if errors:
+                    raise errors[0]
+                job.summaries = results
+                await loop.run_in_executor(None, self._store_cached, job, parts)
+                job.status = "done"
+            except Exception as e:  # Report the failure on the job rather than killing the dispatcher
+                job.status = "failed"
+                job.error = f"{type(e).__name__}: {e}"
+                job.summaries = []
+            finally:
+                for part in parts:
+                    if os.path.exists(part):
+                        os.remove(part)
+                job.finished.set()
+                self.queue.task_done()
+
+    def _cache_path(self, job_id, suffix):
+        return os.path.join(self.data_dir, f"{job_id}.{suffix}")
+
+    def _load_cached(self, job):
+        # The summary file is written last, so its presence means the series file is complete
+        if not (os.path.exists(self._cache_path(job.id, "json")) and os.path.exists(self._cache_path(job.id, "ndjson"))):
+            return False
+        with open(self._cache_path(job.id, "json"), encoding="utf-8") as f:
+            job.summaries = json.load(f)["summaries"]
+        job.series_path = self._cache_path(job.id, "ndjson")
+        return True
+
+    def _store_cached(self, job, parts):
+        # Join the per-seed series in seed order, then write the summaries; never leave half-written entries
+        series_path = self._cache_path(job.id, "ndjson")
+        with open(series_path + ".tmp", "wb") as out:
+            for part in parts:
+                with open(part, "rb") as f:
+                    shutil.copyfileobj(f, out)
+        os.replace(series_path + ".tmp", series_path)
+        summary_path = self._cache_path(job.id, "json")
+        with open(summary_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"model_version": MODEL_VERSION, "scenario": job.scenario, "summaries": job.summaries},
+                      f, separators=(",", ":"))
+        os.replace(summary_path + ".tmp", summary_path)
+        job.series_path = series_path
+
+    async def handle(self, reader, writer):
+        # Minimal HTTP/1.1: one request per connection
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = headers.get("content-length", "0") or "0"
+            if len(request_line) < 2 or not length.isdigit():
+                await self._respond(writer, 400, {"error": "Malformed request"})
+                return
+            if int(length) > MAX_BODY_BYTES:
+                await self._respond(writer, 400, {"error": f"Request body larger than {MAX_BODY_BYTES} bytes"})
+                return
+            body = await reader.readexactly(int(length))
+            await self._route(request_line[0], request_line[1].split("?")[0].rstrip("/"), body, writer)
+        except (ConnectionError, asyncio.IncompleteReadError):  # Client went away mid-request
+            pass
+        except Exception as e:  # e.g. a cache file removed under us: answer instead of dropping the connection
+            try:
+                await self._respond(writer, 500, {"error": f"{type(e).__name__}: {e}"})
+            except ConnectionError:
+                pass
+        finally:
+            writer.close()
+
+    async def _route(self, method, path, body, writer):
+        parts = [p for p in path.split("/") if p]
+        if parts == ["jobs"] and method == "POST":
+            try:
+                job = self.submit(json.loads(body or b"{}"))
+            except ValueError as e:  # Also covers malformed JSON
+                await self._respond(writer, 400, {"error": str(e)})
+                return
+            await self._respond(writer, 200 if job.status == "done" else 202, job.describe())
+        elif parts == ["jobs"] and method == "GET":
+            await self._respond(writer, 200, {"jobs": [job.describe() for job in self.jobs.values()]})
+        elif len(parts) in (2, 3) and parts[0] == "jobs" and method == "GET":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                await self._respond(writer, 404, {"error": f"No job {parts[1]}"})
+            elif len(parts) == 2:
+                await self._respond(writer, 200, job.describe(with_summaries=True))
+            elif parts[2] == "series":
+                await self._stream_series(job, writer)
+            else:
+                await self._respond(writer, 404, {"error": "Not found"})
+        else:
+            await self._respond(writer, 404, {"error": "Not found"})
+
+    async def _respond(self, writer, status, payload):
+        data = json.dumps(payload).encode()
+        writer.write(f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                     f"Connection: close\r\n\r\n".encode() + data)
+        await writer.drain()
+
+    async def _stream_series(self, job, writer):
+        # Waits for the job, then streams its series file (one JSON line per seed and day) using chunked encoding
+        await job.finished.wait()
+        if job.status != "done":
+            await self._respond(writer, 500, job.describe())
+            return
+        loop = asyncio.get_running_loop()
+        with open(job.series_path, "rb") as f:  # Opened before the headers so a missing file still gets a 500
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                         b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+            while chunk := await loop.run_in_executor(None, f.read, SERIES_CHUNK_BYTES):
+                writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
+                await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+async def serve(host="127.0.0.1", port=8765, workers=None, cache_dir=None):
+    service = JobService(workers=workers, cache_dir=cache_dir)
+    await service.start()
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Job service on http://{host}:{port} with {service.workers} workers")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Local batch job service for GovernanceModel scenarios")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on (localhost by default)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="Simulation processes (default: CPU count)")
+    parser.add_argument("--cache-dir", default=".sim_cache", help="Directory for cached results ('' to disable)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.cache_dir or None))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# streams.py: Named random streams, one per decision site, so paired scenarios can share their draws
+import functools
+import hashlib
+import math
+import random
+
+# Decision sites with their own streams. Agent-level sites get one stream per person.
+# "event" only picks the weekly event; "effect" rolls its consequences, per person where one is involved,
+# and "arrival" draws the newcomers, so one scenario's extra LEOs or settlers never shift the event sequence.
+SITES = ("init", "hub", "crime", "chase", "visit", "turn", "death", "stress", "event", "effect", "arrival")
+
+MASK64 = (1 << 64) - 1
+GOLDEN64 = 0x9E3779B97F4A7C15
+
+def _mix64(x):
+    # splitmix64 finalizer: cheap, well-spread 64-bit hash for per-draw slot permutations
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+@functools.lru_cache(maxsize=None)
+def _units(strata):
+    # Multipliers coprime with strata, so a * stratum + b (mod strata) permutes the strata
+    return tuple(a for a in range(1, strata + 1) if math.gcd(a, strata) == 1)
+
+def derive_seed(*parts):
+    """Deterministic 64-bit seed from any mix of values (same parts -> same seed, in every process)."""
+    digest = hashlib.sha256(":".join(str(part) for part in parts).encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+class StreamRandom(random.Random):
+    """random.Random whose every draw (choice, randint, choices, ...) goes through random().
+
+    antithetic mirrors each uniform u to 1 - u. stratum/strata stratifies draws across a set of
+    replicates: the n-th draw of replicate `stratum` lands in its own 1/strata slice of [0, 1),
+    with slices dealt out by a permutation shared by all replicates (a Latin hypercube per draw).
+    The permutation for draw n is an affine map of the stratum keyed by a hash of (seed, n), so a
+    stratified draw costs O(1) whatever the number of strata.
+    """
+
+    def __init__(self, seed, antithetic=False, stratum=None, strata=None):
+        self.antithetic = antithetic
+        self.stratum = stratum
+        self.strata = strata
+        self.shared_seed = seed
+        self.draws = 0
+        self.units = _units(strata) if strata else ()
+        # Stratified replicates share the slice permutation but need their own jitter inside a slice
+        super().__init__(seed if strata is None else derive_seed(seed, "stratum", stratum))
+
+    def random(self):
+        u = super().random()
+        if self.strata:
+            h = _mix64((self.shared_seed + self.draws * GOLDEN64) & MASK64)
+            slot = (self.units[(h >> 32) % len(self.units)] * self.stratum + (h & 0xFFFFFFFF)) % self.strata
+            u = (slot + u) / self.strata
+            self.draws += 1
+        if self.antithetic:
+            u = 1.0 - u
+        return u if u < 1.0 else 0.0
+
+    def _randbelow(self, n):
+        # Map integer draws monotonically from random() so mirroring and stratification carry over
+        return min(int(self.random() * n), n - 1)
+
+class RandomStreams:
+    """Independent generators per decision site (and per person for agent-level sites).
+
+    Two models built with the same seed draw identical numbers at each site, whatever else differs
+    between them (common random numbers). Without a seed, streams follow the global random module.
+    """
+
+    def __init__(self, seed=None, antithetic=False, stratum=None, strata=None):
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.antithetic = antithetic
+        self.stratum = stratum
+        self.strata = strata
+        self._streams = {}
+
+    def get(self, site, key=None):
+        if site not in SITES:
+            raise ValueError(f"Unknown random stream site: {site}")
+        stream = self._streams.get((site, key))
+        if stream is None:
+            stream = StreamRandom(derive_seed(self.seed, site, key), self.antithetic, self.stratum, self.strata)
+            self._streams[(site, key)] = stream
+        return stream
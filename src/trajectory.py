@@ -0,0 +1,132 @@
+# trajectory.py: Record per-day agent states and play them back without the model
+import gzip
+import json
+import math
+from src.hubs import HUBS
+
+KEYFRAME_INTERVAL = 30  # Full state every 30 days, deltas in between (seeking replays at most 29 deltas)
+KINDS = ["settler", "leo", "prisoner", "dead"]
+HUB_NAMES = list(HUBS.keys())
+RING_SPACING = 8  # Pixels between the rings of agents gathered around a hub in replays
+
+def hub_slot(pos, index):
+    """Fixed spot for the index-th agent at a hub: the centre, then rings of 6, 12, 18, ... around it."""
+    if index == 0:
+        return pos
+    ring, slot = 1, index - 1
+    while slot >= 6 * ring:
+        slot -= 6 * ring
+        ring += 1
+    angle = 2 * math.pi * slot / (6 * ring)
+    return (round(pos[0] + RING_SPACING * ring * math.cos(angle)), round(pos[1] + RING_SPACING * ring * math.sin(angle)))
+
+def agent_state(agent):
+    """Compact state of one agent: [kind, gender, is_bad, revealed, hub, chase target]."""
+    from src.model import SettlerAgent, LEAgent, PrisonAgent  # Dynamic import to avoid circular issues
+    hub = HUB_NAMES.index(agent.model.hub_of(agent))
+    if isinstance(agent, SettlerAgent):
+        return [0, agent.gender, int(agent.is_bad), int(agent.revealed), hub, -1]
+    if isinstance(agent, LEAgent):
+        chase = agent.chasing.person_id if agent.chasing else -1
+        return [1, agent.gender, int(agent.is_bad), 1, hub, chase]
+    if isinstance(agent, PrisonAgent):
+        return [2, agent.original_gender, int(agent.is_bad), 1, hub, -1]
+    return [3, agent.original_gender, 0, 1, hub, -1]  # DeadAgent
+
+class TrajectoryRecorder:
+    """Collects one entry per day: a full keyframe every KEYFRAME_INTERVAL days, otherwise only changed agents."""
+
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.days = []
+        self._last = {}  # person_id -> state on the previous recorded day
+
+    def record(self, model):
+        states = {str(agent.person_id): agent_state(agent) for agent in model.agents}
+        metrics = [model.week, model.civility, model.resources, round(model.conflict_rate, 4),
+                   round(model.stress, 2), len(model.living_agents), model.morgue_count, model.prison_count]
+        if len(self.days) % self.keyframe_interval == 0:
+            entry = {"metrics": metrics, "keyframe": states}
+        else:
+            changed = {pid: state for pid, state in states.items() if self._last.get(pid) != state}
+            removed = [pid for pid in self._last if pid not in states]
+            entry = {"metrics": metrics, "delta": changed, "removed": removed}
+        self.days.append(entry)
+        self._last = states
+
+    def save(self, path):
+        # Gzipped JSON lines: a header, then one line per recorded day
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            header = {"keyframe_interval": self.keyframe_interval, "hubs": HUB_NAMES, "kinds": KINDS}
+            f.write(json.dumps(header, separators=(",", ":")) + "\n")
+            for entry in self.days:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+class Trajectory:
+    """A saved recording with random access to any day."""
+
+    def __init__(self, header, days):
+        self.keyframe_interval = header["keyframe_interval"]
+        self.hubs = header["hubs"]
+        self.kinds = header["kinds"]
+        self.days = days
+
+    @classmethod
+    def load(cls, path):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            days = [json.loads(line) for line in f]
+        return cls(header, days)
+
+    def __len__(self):
+        return len(self.days)
+
+    def states_at(self, day):
+        """Agent states on a day: the nearest earlier keyframe plus at most keyframe_interval - 1 deltas."""
+        start = day - day % self.keyframe_interval
+        states = dict(self.days[start]["keyframe"])
+        for entry in self.days[start + 1:day + 1]:
+            for pid in entry["removed"]:
+                states.pop(pid, None)
+            states.update(entry["delta"])
+        return states
+
+    def layout(self, states):
+        """Screen position of every agent in a states_at() dict, spread around its hub in person_id order."""
+        positions = {}
+        counts = {}
+        for pid in sorted(states, key=int):  # Same order every day, so agents that stay put keep their spot
+            hub = states[pid][4]
+            positions[pid] = hub_slot(HUBS[self.hubs[hub]]["pos"], counts.get(hub, 0))
+            counts[hub] = counts.get(hub, 0) + 1
+        return positions
+
+    def frame(self, day, states=None, start=None, progress=1.0):
+        """Build a visualize.render() frame for a day, placing each agent in a ring around its hub.
+
+        states reuses a states_at(day) result. start maps person_id to the position an agent moves
+        from (e.g. the previous day's layout) and progress is how much of that move is done.
+        """
+        week, civility, resources, conflict_rate, stress, population, morgue_count, prison_count = self.days[day]["metrics"]
+        states = self.states_at(day) if states is None else states
+        positions = self.layout(states)
+        agents = []
+        for pid, (kind, gender, is_bad, revealed, hub, chase) in states.items():
+            x, y = positions[pid]
+            if start and pid in start:  # New arrivals appear at their hub
+                x = round(start[pid][0] + (x - start[pid][0]) * progress)
+                y = round(start[pid][1] + (y - start[pid][1]) * progress)
+            agents.append((self.kinds[kind], gender, bool(is_bad), bool(revealed), x, y))
+        return {
+            "week": week,
+            "civility": civility,
+            "resources": resources,
+            "conflict_rate": conflict_rate,
+            "stress": stress,
+            "population": population,
+            "morgue_count": morgue_count,
+            "prison_count": prison_count,
+            "changes": [],
+            "is_manual": True,
+            "agents": agents,
+        }
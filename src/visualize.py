@@ -1,5 +1,6 @@
 import pygame
 from src.model import GovernanceModel, SettlerAgent, PrisonAgent, LEAgent, DeadAgent
+from src.trajectory import Trajectory
 
 pygame.init()
 screen = pygame.display.set_mode((800, 600))  # Bigger for dashboard and glossary
@@ -26,8 +27,35 @@ HUBS = {
     "Morgue": {"pos": (750, 350), "risk": 0.1, "purpose": "absorbing"}              # Far right, near center, moved right 50
 }
 
-def draw(model):
-    screen.fill((0, 0, 0))
+def snapshot(model):
+    """Capture everything render() needs from the model as plain, picklable data."""
+    agents = []  # (kind, gender, is_bad, revealed, x, y)
+    for agent in model.agents:
+        if isinstance(agent, SettlerAgent):
+            agents.append(("settler", agent.gender, agent.is_bad, agent.revealed, agent.pos[0], agent.pos[1]))
+        elif isinstance(agent, LEAgent):
+            agents.append(("leo", agent.gender, agent.is_bad, True, agent.pos[0], agent.pos[1]))
+        elif isinstance(agent, PrisonAgent):
+            agents.append(("prisoner", agent.original_gender, agent.is_bad, True, agent.pos[0], agent.pos[1]))
+        elif isinstance(agent, DeadAgent):
+            agents.append(("dead", agent.original_gender, False, True, agent.pos[0], agent.pos[1]))
+    return {
+        "week": model.week,
+        "civility": model.civility,
+        "resources": model.resources,
+        "conflict_rate": model.conflict_rate,
+        "stress": model.stress,
+        "population": len(model.living_agents),
+        "morgue_count": model.morgue_count,
+        "prison_count": model.prison_count,
+        "changes": model.changes_log[-5:],  # Show last 5 changes
+        "is_manual": model.is_manual,
+        "agents": agents,
+    }
+
+def render(surface, frame):
+    """Draw one snapshot() frame onto any surface (the window or an offscreen one)."""
+    surface.fill((0, 0, 0))
     # Draw glossary on the left with icons (corrected colors)
     glossary = [
         ("Neutral Settler (M)", (128, 128, 128), pygame.Rect(10, 10, 10, 10)),  # Grey square (male)
@@ -41,104 +69,100 @@ def draw(model):
         ("Corrupt Law Enforcement", (255, 0, 128), (30, 95, 10, 0)),  # Purple dot (corrupt LEO, circle)
         ("Dead Agent", (100, 100, 100), (30, 115, 10, 0))  # Dark grey dot (dead, circle)
     ]
-    pygame.draw.rect(screen, (50, 50, 50), (0, 0, 200, 600))  # Grey background for glossary
+    pygame.draw.rect(surface, (50, 50, 50), (0, 0, 200, 600))  # Grey background for glossary
     for i, (text, color, shape) in enumerate(glossary):
         if isinstance(shape, pygame.Rect):  # Square for male agents
-            pygame.draw.rect(screen, color, (shape.x, shape.y, 10, 10))
+            pygame.draw.rect(surface, color, (shape.x, shape.y, 10, 10))
         else:  # Circle for female agents and others
-            pygame.draw.circle(screen, color, (shape[0], shape[1]), 5)
+            pygame.draw.circle(surface, color, (shape[0], shape[1]), 5)
         rendered = small_font.render(text, True, (255, 255, 255))
-        screen.blit(rendered, (50, 10 + i * 18))  # Tighter spacing for smaller font
+        surface.blit(rendered, (50, 10 + i * 18))  # Tighter spacing for smaller font
 
     # Draw hubs with colors based on risk and counters
     for hub_name, hub in HUBS.items():
         risk = hub["risk"]
         color = (0, 255, 0) if risk < 0.3 else (255, 255, 0) if risk < 0.6 else (255, 0, 0)
-        pygame.draw.circle(screen, color, hub["pos"], 20, 1)
+        pygame.draw.circle(surface, color, hub["pos"], 20, 1)
         # Label hubs above with smaller font
         rendered = small_font.render(hub_name, True, (255, 255, 255))
-        screen.blit(rendered, (hub["pos"][0] - rendered.get_width() // 2, hub["pos"][1] - 25))
+        surface.blit(rendered, (hub["pos"][0] - rendered.get_width() // 2, hub["pos"][1] - 25))
         # Display counters inside Prison Hub and Morgue
         if hub_name == "Prison Hub":
-            counter_text = f"Prison: {model.prison_count}"
+            counter_text = f"Prison: {frame['prison_count']}"
             counter_rendered = small_font.render(counter_text, True, (255, 255, 255))
-            screen.blit(counter_rendered, (hub["pos"][0] - counter_rendered.get_width() // 2, hub["pos"][1] - 5))
+            surface.blit(counter_rendered, (hub["pos"][0] - counter_rendered.get_width() // 2, hub["pos"][1] - 5))
         elif hub_name == "Morgue":
-            counter_text = f"Morgue: {model.morgue_count}"
+            counter_text = f"Morgue: {frame['morgue_count']}"
             counter_rendered = small_font.render(counter_text, True, (255, 255, 255))
-            screen.blit(counter_rendered, (hub["pos"][0] - counter_rendered.get_width() // 2, hub["pos"][1] - 5))
+            surface.blit(counter_rendered, (hub["pos"][0] - counter_rendered.get_width() // 2, hub["pos"][1] - 5))
 
     # Draw agents with animation (fixed position unpacking)
-    for agent in model.agents:
-        if isinstance(agent, SettlerAgent):
-            color = (255, 0, 0) if agent.is_bad and agent.revealed else (255, 165, 0) if agent.is_bad else (128, 128, 128)
-            # Clamp position to stay within 800x600, adjust for glossary and spacing
-            x = max(225, min(775, agent.pos[0]))  # X coordinate
-            y = max(25, min(575, agent.pos[1]))   # Y coordinate
-            if agent.gender == "M":
-                pygame.draw.rect(screen, color, (x - 5, y - 5, 10, 10))  # Square for male
+    for kind, gender, is_bad, revealed, x, y in frame["agents"]:
+        # Clamp position to stay within 800x600, adjust for glossary and spacing
+        x = max(225, min(775, x))  # X coordinate
+        y = max(25, min(575, y))   # Y coordinate
+        if kind == "settler":
+            color = (255, 0, 0) if is_bad and revealed else (255, 165, 0) if is_bad else (128, 128, 128)
+            if gender == "M":
+                pygame.draw.rect(surface, color, (x - 5, y - 5, 10, 10))  # Square for male
             else:
-                pygame.draw.circle(screen, color, (x, y), 5)  # Dot for female
-        elif isinstance(agent, LEAgent):
-            color = (255, 0, 128) if agent.is_bad else (0, 0, 255)  # Purple for corrupt, blue for good
-            x = max(225, min(775, agent.pos[0]))  # X coordinate
-            y = max(25, min(575, agent.pos[1]))   # Y coordinate
-            if agent.gender == "M":
-                pygame.draw.rect(screen, color, (x - 5, y - 5, 10, 10))  # Square for male LEO
+                pygame.draw.circle(surface, color, (x, y), 5)  # Dot for female
+        elif kind == "leo":
+            color = (255, 0, 128) if is_bad else (0, 0, 255)  # Purple for corrupt, blue for good
+            if gender == "M":
+                pygame.draw.rect(surface, color, (x - 5, y - 5, 10, 10))  # Square for male LEO
             else:
-                pygame.draw.circle(screen, color, (x, y), 5)  # Dot for female LEO
-        elif isinstance(agent, PrisonAgent):
-            x = max(225, min(775, agent.pos[0]))  # X coordinate
-            y = max(25, min(575, agent.pos[1]))   # Y coordinate
-            color = (255, 0, 0) if agent.is_bad else (128, 128, 128)  # Red for bad, grey for others
-            if agent.original_gender == "M":
-                pygame.draw.rect(screen, color, (x - 5, y - 5, 10, 10), 2)  # Outline square for male prisoners
+                pygame.draw.circle(surface, color, (x, y), 5)  # Dot for female LEO
+        elif kind == "prisoner":
+            color = (255, 0, 0) if is_bad else (128, 128, 128)  # Red for bad, grey for others
+            if gender == "M":
+                pygame.draw.rect(surface, color, (x - 5, y - 5, 10, 10), 2)  # Outline square for male prisoners
             else:
-                pygame.draw.circle(screen, color, (x, y), 5, 2)  # Outline dot for female prisoners
-        elif isinstance(agent, DeadAgent):
-            x = max(225, min(775, agent.pos[0]))  # X coordinate
-            y = max(25, min(575, agent.pos[1]))   # Y coordinate
-            pygame.draw.circle(screen, (100, 100, 100), (x, y), 5, 2)  # Dark grey outline dot for dead
+                pygame.draw.circle(surface, color, (x, y), 5, 2)  # Outline dot for female prisoners
+        elif kind == "dead":
+            pygame.draw.circle(surface, (100, 100, 100), (x, y), 5, 2)  # Dark grey outline dot for dead
 
     # Dashboard (top area, remove Morgue and Prison counters, smaller font)
-    pygame.draw.rect(screen, (50, 50, 50), (0, 0, 800, 80))  # Slightly smaller dashboard for better fit
+    pygame.draw.rect(surface, (50, 50, 50), (0, 0, 800, 80))  # Slightly smaller dashboard for better fit
     metrics = [
-        f"Day: {model.week}",
-        f"Civility: {model.civility}",
-        f"Resources: {model.resources}",
-        f"Conflict: {model.conflict_rate:.2f}",
-        f"Stress: {model.stress:.0f}",
-        f"Pop: {len(model.living_agents)}"
+        f"Day: {frame['week']}",
+        f"Civility: {frame['civility']}",
+        f"Resources: {frame['resources']}",
+        f"Conflict: {frame['conflict_rate']:.2f}",
+        f"Stress: {frame['stress']:.0f}",
+        f"Pop: {frame['population']}"
     ]
     for i, text in enumerate(metrics):
         rendered = font.render(text, True, (255, 255, 255))
-        screen.blit(rendered, (210, 10 + i * 16))  # Tighter spacing for smaller font, shift right to avoid glossary
+        surface.blit(rendered, (210, 10 + i * 16))  # Tighter spacing for smaller font, shift right to avoid glossary
 
     # Change log (scrolling text, even smaller font, repositioned)
-    changes = model.changes_log[-5:]  # Show last 5 changes
-    pygame.draw.rect(screen, (50, 50, 50), (400, 80, 400, 100))  # Adjusted change log area
+    changes = frame["changes"]
+    pygame.draw.rect(surface, (50, 50, 50), (400, 80, 400, 100))  # Adjusted change log area
     for i, text in enumerate(changes):
         rendered = tiny_font.render(text, True, (255, 255, 255))
-        screen.blit(rendered, (410, 90 + i * 12))  # Tighter, smaller spacing
+        surface.blit(rendered, (410, 90 + i * 12))  # Tighter, smaller spacing
 
     # Civility gauge (bottom, repositioned)
-    pygame.draw.rect(screen, (0, 255, 0) if model.civility > 50 else (255, 0, 0), (210, 570, model.civility * 4, 10))  # Shifted down, right
+    pygame.draw.rect(surface, (0, 255, 0) if frame["civility"] > 50 else (255, 0, 0), (210, 570, frame["civility"] * 4, 10))  # Shifted down, right
 
     # Draw manual and auto buttons (improved visibility, dynamic colors)
-    manual_color = (0, 255, 0) if model.is_manual else (150, 150, 150)  # Green if active, grey if inactive
-    auto_color = (150, 150, 150) if model.is_manual else (0, 255, 0)  # Grey if manual active, green if auto active
-    pygame.draw.rect(screen, manual_color, (700, 10, 80, 30))  # "Manual" button
+    manual_color = (0, 255, 0) if frame["is_manual"] else (150, 150, 150)  # Green if active, grey if inactive
+    auto_color = (150, 150, 150) if frame["is_manual"] else (0, 255, 0)  # Grey if manual active, green if auto active
+    pygame.draw.rect(surface, manual_color, (700, 10, 80, 30))  # "Manual" button
     rendered = font.render("Manual", True, (0, 0, 0))  # Black text for contrast
-    screen.blit(rendered, (720, 15))  # Center text in manual button
+    surface.blit(rendered, (720, 15))  # Center text in manual button
 
-    pygame.draw.rect(screen, auto_color, (700, 50, 80, 30))  # "Auto" button
+    pygame.draw.rect(surface, auto_color, (700, 50, 80, 30))  # "Auto" button
     rendered = font.render("Auto", True, (0, 0, 0))  # Black text for contrast
-    screen.blit(rendered, (720, 55))  # Center text in auto button
+    surface.blit(rendered, (720, 55))  # Center text in auto button
 
+def draw(model):
+    render(screen, snapshot(model))
     pygame.display.flip()
 
-def run():
-    model = GovernanceModel()
+def run(record_path=None, network_dir=None):
+    model = GovernanceModel(record=record_path is not None, track_contacts=network_dir is not None)
     running = True
     auto_timer = 0
 
@@ -166,6 +190,70 @@ def run():
 
         draw(model)
         clock.tick(30)  # 30 FPS
+    if model.trajectory:
+        model.trajectory.save(record_path)
+    if network_dir:
+        model.export_network(network_dir)
+    pygame.quit()
+
+def replay(path):
+    # Play back a recorded trajectory: no model, any day reachable instantly
+    trajectory = Trajectory.load(path)
+    last_day = len(trajectory) - 1
+    day = 0
+    playing = False
+    running = True
+    auto_timer = 0
+
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    playing = not playing
+                elif event.key == pygame.K_RIGHT:
+                    day = min(last_day, day + 1)
+                elif event.key == pygame.K_LEFT:
+                    day = max(0, day - 1)
+                elif event.key == pygame.K_UP:  # Jump a week
+                    day = min(last_day, day + 7)
+                elif event.key == pygame.K_DOWN:
+                    day = max(0, day - 7)
+                elif event.key == pygame.K_HOME:
+                    day = 0
+                elif event.key == pygame.K_END:
+                    day = last_day
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left click
+                if 700 <= event.pos[0] <= 780 and 10 <= event.pos[1] <= 40:  # Manual button pauses
+                    playing = False
+                elif 700 <= event.pos[0] <= 780 and 50 <= event.pos[1] <= 80:  # Auto button plays
+                    playing = True
+                elif 210 <= event.pos[0] <= 790 and event.pos[1] >= 583:  # Click the scrub bar to seek
+                    day = round((event.pos[0] - 210) / 580 * last_day)
+            elif event.type == pygame.MOUSEMOTION and event.buttons[0] and event.pos[1] >= 583:  # Drag to scrub
+                day = round((max(210, min(790, event.pos[0])) - 210) / 580 * last_day)
+
+        if playing:
+            auto_timer += clock.get_rawtime() / 1000  # Convert milliseconds to seconds
+            if auto_timer >= 0.1:  # Ten days per second
+                day = min(last_day, day + 1)
+                playing = day < last_day
+                auto_timer = 0
+
+        frame = trajectory.frame(day)
+        frame["is_manual"] = not playing
+        frame["changes"] = [f"Replay: day {day} of {last_day}",
+                            "Space/Auto: play, Manual: pause",
+                            "Left/Right: one day, Up/Down: one week, Home/End",
+                            "Click or drag the bar at the bottom to seek"]
+        render(screen, frame)
+        # Scrub bar under the civility gauge
+        pygame.draw.rect(screen, (80, 80, 80), (210, 585, 580, 8))
+        marker_x = 210 + (580 * day // last_day if last_day else 0)
+        pygame.draw.rect(screen, (255, 255, 255), (marker_x - 2, 583, 4, 12))
+        pygame.display.flip()
+        clock.tick(30)  # 30 FPS
     pygame.quit()
 
 if __name__ == "__main__":